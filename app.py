@@ -4,30 +4,123 @@
 재무제표 시각화 웹 애플리케이션 (리팩토링 버전)
 """
 
+import hashlib
+import logging
 import os
+import threading
+from functools import lru_cache
 from typing import Any, Dict, List, Optional, Tuple
-from flask import Flask, render_template, request, jsonify
+import numpy as np
+from cachetools import LRUCache
+from flask import Flask, Response, g, has_request_context, render_template, request, jsonify
+from flask_compress import Compress
+from jinja2 import FileSystemBytecodeCache
+from flask.json.provider import JSONProvider
 from opendart_client import OpenDartClient
 from data_service import FinancialDataService
 from chart_service import ChartService
 from utils import (
-    convert_to_json_serializable,
     format_amount,
+    build_search_index,
+    json_dumps,
+    json_loads,
     load_corp_database,
+    percent_ratios,
     search_company
 )
 
+logger = logging.getLogger(__name__)
+
+# 응답 본문을 만드는 코드와 템플릿 (내용이 바뀌면 ETag도 바뀌어 이전 배포의 캐시를 재사용하지 않음)
+_CACHE_VERSION_SOURCES = ('app.py', 'chart_service.py', 'data_service.py', 'utils.py', 'templates')
+
+
+def _iter_source_files(path: str):
+    """경로가 파일이면 그대로, 디렉터리면 하위 파일 전체를 정렬된 순서로 생성"""
+    if not os.path.isdir(path):
+        yield path
+        return
+    for dir_path, dir_names, file_names in os.walk(path):
+        dir_names.sort()
+        for file_name in sorted(file_names):
+            file_path = os.path.join(dir_path, file_name)
+            if os.path.isfile(file_path):
+                yield file_path
+
+
+def _cache_version() -> bytes:
+    """응답 생성 코드와 템플릿 내용의 해시 (워커 간에도 동일한 값)"""
+    base_dir = os.path.dirname(os.path.abspath(__file__))
+    digest = hashlib.blake2b(digest_size=8)
+    for source in _CACHE_VERSION_SOURCES:
+        for file_path in _iter_source_files(os.path.join(base_dir, source)):
+            digest.update(os.path.relpath(file_path, base_dir).encode('utf-8'))
+            with open(file_path, 'rb') as f:
+                digest.update(f.read())
+    return digest.digest()
+
+
+CACHE_VERSION = _cache_version()
+
+
+def _etag(*parts: bytes) -> str:
+    """응답 내용과 CACHE_VERSION 기반 ETag 값 생성 (워커 간에도 동일한 값)"""
+    digest = hashlib.blake2b(CACHE_VERSION, digest_size=8)
+    for part in parts:
+        digest.update(part)
+    return digest.hexdigest()
+
+
+class OrjsonProvider(JSONProvider):
+    """orjson 기반 Flask JSON 프로바이더 (orjson이 없으면 표준 json 사용)"""
+    
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        return json_dumps(obj).decode('utf-8')
+    
+    def loads(self, s: Any, **kwargs: Any) -> Any:
+        return json_loads(s)
+    
+    def response(self, *args: Any, **kwargs: Any) -> Response:
+        """직렬화된 바이트를 디코딩 없이 그대로 응답 본문으로 사용"""
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(json_dumps(obj), mimetype='application/json')
+
 
 class FinancialDashboardApp:
     """재무 대시보드 애플리케이션 클래스"""
     
     def __init__(self):
         self.app = Flask(__name__)
+        self.app.json = OrjsonProvider(self.app)
+        
+        # 응답 압축 (계정명 등 반복이 많은 JSON/HTML 응답 크기 축소)
+        self.app.config['COMPRESS_ALGORITHM'] = ['br', 'gzip']
+        self.app.config['COMPRESS_MIMETYPES'] = ['application/json', 'text/html']
+        self.app.config['COMPRESS_LEVEL'] = 4
+        self.app.config['COMPRESS_BR_LEVEL'] = 4
+        Compress(self.app)
+        
+        # 템플릿 바이트코드 캐시 (새 워커가 템플릿을 다시 파싱하지 않도록 디스크에 저장)
+        jinja_cache_dir = os.path.join(self.app.root_path, '.jinja_cache')
+        os.makedirs(jinja_cache_dir, exist_ok=True)
+        self.app.jinja_env.bytecode_cache = FileSystemBytecodeCache(jinja_cache_dir)
         self.corp_database = {}
+        self.search_index = {}
         self.opendart_client = None
         self.data_service = None
         self.chart_service = None
         
+        # 검색 응답 캐시 (정규화된 검색어 -> 직렬화된 JSON 바이트)
+        self._cached_search = lru_cache(maxsize=4096)(self._encode_search_results)
+        
+        # /financial-api 응답 캐시 (조회 조건 + 데이터 해시 -> 직렬화된 JSON 바이트)
+        self._response_cache = LRUCache(maxsize=512)
+        self._response_cache_lock = threading.Lock()
+        
+        # 기간별 분석 요약 캐시 (데이터 해시 -> 연도 목록, 연도별 주요 지표)
+        self._summary_cache = LRUCache(maxsize=256)
+        self._summary_cache_lock = threading.Lock()
+        
         # 템플릿 필터 등록
         self.app.template_filter('format_amount')(format_amount)
         
@@ -38,6 +131,8 @@ class FinancialDashboardApp:
         """애플리케이션 초기화"""
         # 데이터베이스 로드
         self.corp_database, success = load_corp_database()
+        self.search_index = build_search_index(self.corp_database)
+        self._cached_search.cache_clear()
         if not success:
             return False
         
@@ -46,10 +141,14 @@ class FinancialDashboardApp:
             self.opendart_client = OpenDartClient()
             self.data_service = FinancialDataService(self.opendart_client)
             self.chart_service = ChartService()
-            print("✅ OpenDart 클라이언트 초기화 완료")
+            with self._response_cache_lock:
+                self._response_cache.clear()
+            with self._summary_cache_lock:
+                self._summary_cache.clear()
+            logger.info("✅ OpenDart 클라이언트 초기화 완료")
             return True
         except Exception as e:
-            print(f"❌ OpenDart 클라이언트 초기화 실패: {e}")
+            logger.error("❌ OpenDart 클라이언트 초기화 실패: %s", e)
             return False
     
     def _register_routes(self):
@@ -68,12 +167,16 @@ class FinancialDashboardApp:
         @self.app.route('/search')
         def search():
             """회사 검색 API"""
-            company_name = request.args.get('q', '')
+            company_name = request.args.get('q', '').strip().lower()
             if not company_name:
                 return jsonify([])
             
-            results = search_company(company_name, self.corp_database)
-            return jsonify(results)
+            data, etag = self._cached_search(company_name)
+            not_modified = self._not_modified(etag, max_age=60)
+            if not_modified is not None:
+                return not_modified
+            
+            return self._with_cache_headers(Response(data, mimetype='application/json'), etag, max_age=60)
         
         @self.app.route('/financial-api')
         def financial_api():
@@ -103,9 +206,6 @@ class FinancialDashboardApp:
                     if not financial_data:
                         return jsonify({'error': error_message}), 404
                     
-                    # 기간별 차트 생성
-                    charts = self.chart_service.create_period_charts(financial_data)
-                    
                 else:
                     # 단일 연도 조회
                     year = request.args.get('year', '2022')
@@ -117,28 +217,44 @@ class FinancialDashboardApp:
                     
                     if not financial_data:
                         return jsonify({'error': error_message}), 404
-                    
-                    # 단일 연도 차트 생성
-                    print(f"📊 차트 생성 시작: 데이터 항목 수 {len(financial_data)}")
-                    charts = self.chart_service.create_financial_charts(financial_data)
-                    print(f"📈 생성된 차트 수: {len(charts) if charts else 0}")
-                    if charts:
-                        print(f"📋 차트 종류: {list(charts.keys())}")
                 
-                # JSON 직렬화 가능한 형태로 변환
-                serializable_data = convert_to_json_serializable(financial_data)
-                serializable_charts = convert_to_json_serializable(charts)
+                # 동일한 조회 결과에 대해서는 차트 생성과 직렬화를 건너뜀
+                data_json = self._encode_financial_data(financial_data)
+                etag = _etag(request.query_string, data_json)
+                not_modified = self._not_modified(etag, max_age=0)
+                if not_modified is not None:
+                    return not_modified
+                
+                # 응답 본문은 쿼리(조회 모드, 회사)와 데이터로 결정되므로 둘을 모두 해시한 ETag를 키로 사용
+                cache_key = etag
+                with self._response_cache_lock:
+                    body = self._response_cache.get(cache_key)
+                
+                if body is None:
+                    if view_mode == 'period':
+                        # 기간별 차트 생성
+                        charts = self.chart_service.create_period_charts(financial_data)
+                    else:
+                        # 단일 연도 차트 생성
+                        logger.debug("📊 차트 생성 시작: 데이터 항목 수 %d", len(financial_data))
+                        charts = self.chart_service.create_financial_charts(financial_data)
+                        logger.debug("📈 생성된 차트 수: %d, 차트 종류: %s", len(charts), charts.keys())
+                    
+                    # 해시 계산에 사용한 데이터 직렬화 결과를 그대로 이어 붙여 응답 본문 구성
+                    body = b''.join((
+                        b'{"success":true,"data":', data_json,
+                        b',"charts":', json_dumps(charts),
+                        b',"corp_name":', json_dumps(corp_name),
+                        b',"corp_code":', json_dumps(corp_code),
+                        b'}'
+                    ))
+                    with self._response_cache_lock:
+                        self._response_cache[cache_key] = body
                 
-                return jsonify({
-                    'success': True,
-                    'data': serializable_data,
-                    'charts': serializable_charts,
-                    'corp_name': corp_name,
-                    'corp_code': corp_code
-                })
+                return self._with_cache_headers(Response(body, mimetype='application/json'), etag, max_age=0)
                 
             except Exception as e:
-                print(f"❌ API 오류: {e}")
+                logger.exception("❌ API 오류: %s", e)
                 return jsonify({'error': f'서버 오류가 발생했습니다: {str(e)}'}), 500
         
         @self.app.route('/financial')
@@ -158,7 +274,8 @@ class FinancialDashboardApp:
                     return render_template('financial.html', error="회사코드가 필요합니다.")
                 
                 # 기간별 조회인지 단일 연도 조회인지 확인
-                if view_mode == 'period' and start_year and end_year:
+                is_period = view_mode == 'period' and start_year and end_year
+                if is_period:
                     # 기간별 재무제표 데이터 가져오기
                     financial_data, error_message = self.data_service.get_financial_data_range_with_error_handling(
                         corp_code, start_year, end_year, report_code, corp_name
@@ -177,10 +294,6 @@ class FinancialDashboardApp:
                                              charts=None,
                                              financial_data=[])
                     
-                    # 기간별 차트 생성
-                    charts = self.chart_service.create_period_charts(financial_data)
-                    display_data = self.data_service.get_formatted_financial_data(financial_data, 50)
-                    
                 else:
                     # 단일 연도 재무제표 데이터 가져오기
                     financial_data, error_message = self.data_service.get_financial_data_with_error_handling(
@@ -199,7 +312,18 @@ class FinancialDashboardApp:
                                              view_mode=view_mode,
                                              charts=None,
                                              financial_data=[])
-                    
+                
+                # 브라우저 캐시가 유효하면 차트 생성과 렌더링을 건너뜀
+                etag = _etag(request.query_string, self._encode_financial_data(financial_data))
+                not_modified = self._not_modified(etag, max_age=3600)
+                if not_modified is not None:
+                    return not_modified
+                
+                if is_period:
+                    # 기간별 차트 생성
+                    charts = self.chart_service.create_period_charts(financial_data)
+                    display_data = self.data_service.get_formatted_financial_data(financial_data, 50)
+                else:
                     # 단일 연도 차트 생성
                     charts = self.chart_service.create_financial_charts(financial_data)
                     display_data = self.data_service.get_formatted_financial_data(financial_data, 20)
@@ -209,7 +333,7 @@ class FinancialDashboardApp:
                 if view_mode == 'period' and financial_data:
                     analysis_summary = self._create_analysis_summary(financial_data, start_year, end_year)
                 
-                return render_template('financial.html', 
+                html = render_template('financial.html', 
                                      corp_name=corp_name,
                                      corp_code=corp_code,
                                      year=year,
@@ -220,78 +344,132 @@ class FinancialDashboardApp:
                                      charts=charts,
                                      financial_data=display_data,
                                      analysis_summary=analysis_summary)
+                return self._with_cache_headers(Response(html, mimetype='text/html'), etag, max_age=3600)
                 
             except Exception as e:
-                print(f"❌ 페이지 오류: {e}")
+                logger.exception("❌ 페이지 오류: %s", e)
                 return render_template('financial.html', error=f"서버 오류가 발생했습니다: {str(e)}")
     
+    def _encode_financial_data(self, financial_data: List[Dict[str, Any]]) -> bytes:
+        """재무 데이터 JSON 직렬화 (같은 요청 안에서는 결과 재사용)"""
+        if not has_request_context():
+            return json_dumps(financial_data)
+        
+        # ETag, 응답 캐시 키, 분석 요약 캐시 키가 모두 같은 직렬화 결과를 사용
+        memo = g.setdefault('encoded_financial_data', {})
+        entry = memo.get(id(financial_data))
+        if entry is None or entry[0] is not financial_data:
+            entry = memo[id(financial_data)] = (financial_data, json_dumps(financial_data))
+        return entry[1]
+    
+    def _not_modified(self, etag: str, max_age: int) -> Optional[Response]:
+        """요청의 If-None-Match가 ETag와 일치하면 304 응답 반환"""
+        if not request.if_none_match.contains_weak(etag):
+            return None
+        return self._with_cache_headers(Response(status=304), etag, max_age)
+    
+    def _with_cache_headers(self, response: Response, etag: str, max_age: int) -> Response:
+        """ETag와 Cache-Control 헤더 설정 (max_age가 0이면 매번 ETag로 재검증하도록 no-cache)"""
+        response.set_etag(etag, weak=True)
+        response.cache_control.public = True
+        if max_age:
+            response.cache_control.max_age = max_age
+        else:
+            response.cache_control.no_cache = True
+        return response
+    
+    def _encode_search_results(self, company_name: str) -> Tuple[bytes, str]:
+        """회사 검색 결과를 JSON 바이트와 ETag로 직렬화 (검색 캐시용)"""
+        data = json_dumps(search_company(company_name, self.search_index))
+        return data, _etag(data)
+    
     def _create_analysis_summary(self, financial_data: List[Dict[str, Any]], start_year: str, end_year: str) -> Dict[str, Any]:
         """기간별 분석 요약 정보 생성"""
         try:
-            # 데이터프레임 생성
-            import pandas as pd
-            df = pd.DataFrame(financial_data)
-            
-            # 연도별 데이터 그룹화
-            year_data = {}
-            for _, row in df.iterrows():
-                year = row.get('bsns_year', '')
-                if year not in year_data:
-                    year_data[year] = {'BS': [], 'IS': []}
-                
-                fs_div = row.get('fs_div', '')
-                if fs_div in ['BS', 'IS', 'CFS']:
-                    # CFS 데이터는 BS와 IS 모두에 포함
-                    if fs_div == 'CFS':
-                        year_data[year]['BS'].append(row.to_dict())
-                        year_data[year]['IS'].append(row.to_dict())
-                    else:
-                        year_data[year][fs_div].append(row.to_dict())
+            # 동일한 데이터에 대해서는 DataFrame 집계 결과를 재사용
+            data_hash = hash(self._encode_financial_data(financial_data))
+            with self._summary_cache_lock:
+                cached = self._summary_cache.get(data_hash)
+            if cached is None:
+                cached = self._build_key_metrics(financial_data)
+                with self._summary_cache_lock:
+                    self._summary_cache[data_hash] = cached
+            years, key_metrics = cached
             
             # 요약 정보 생성
             summary = {
                 'period': f"{start_year}년 ~ {end_year}년",
-                'total_years': len(year_data),
-                'years': sorted(year_data.keys()),
-                'key_metrics': {}
+                'total_years': len(years),
+                'years': years,
+                'key_metrics': key_metrics
             }
             
-            # 주요 지표 추출
-            for year in sorted(year_data.keys()):
-                bs_data = year_data[year]['BS']
-                is_data = year_data[year]['IS']
-                
-                if not bs_data or not is_data:
-                    continue
-                
-                bs_dict = {item['account_nm']: item for item in bs_data}
-                is_dict = {item['account_nm']: item for item in is_data}
-                
-                # 주요 지표 계산
-                revenue = float(is_dict.get('매출액', {}).get('thstrm_amount', 0))
-                net_income = float(is_dict.get('당기순이익', {}).get('thstrm_amount', 0))
-                total_assets = float(bs_dict.get('자산총계', {}).get('thstrm_amount', 0))
-                total_equity = float(bs_dict.get('자본총계', {}).get('thstrm_amount', 0))
-                
-                summary['key_metrics'][year] = {
-                    'revenue': revenue,
-                    'net_income': net_income,
-                    'total_assets': total_assets,
-                    'total_equity': total_equity,
-                    'roe': (net_income / total_equity * 100) if total_equity > 0 else 0,
-                    'roa': (net_income / total_assets * 100) if total_assets > 0 else 0
-                }
-            
             return summary
             
         except Exception as e:
-            print(f"❌ 분석 요약 생성 오류: {e}")
+            logger.error("❌ 분석 요약 생성 오류: %s", e)
             return None
     
-    def run(self, debug: bool = True, host: str = '0.0.0.0', port: int = 8080):
+    def _build_key_metrics(
+        self, 
+        financial_data: List[Dict[str, Any]]
+    ) -> Tuple[List[str], Dict[str, Dict[str, float]]]:
+        """연도 목록과 연도별 주요 지표 계산"""
+        # 한 번의 순회로 연도별 주요 계정 값만 추출 (같은 계정은 마지막 항목 사용)
+        # CFS 데이터는 BS와 IS 모두에 포함
+        year_values = {}
+        bs_years = set()
+        is_years = set()
+        
+        for item in financial_data:
+            year = item.get('bsns_year', '')
+            values = year_values.get(year)
+            if values is None:
+                values = year_values[year] = {}
+            
+            fs_div = item.get('fs_div', '')
+            if fs_div not in ('BS', 'IS', 'CFS'):
+                continue
+            
+            account_nm = item['account_nm']
+            if fs_div != 'IS':
+                bs_years.add(year)
+                if account_nm == '자산총계' or account_nm == '자본총계':
+                    values[account_nm] = item.get('thstrm_amount', 0)
+            if fs_div != 'BS':
+                is_years.add(year)
+                if account_nm == '매출액' or account_nm == '당기순이익':
+                    values[account_nm] = item.get('thstrm_amount', 0)
+        
+        years = sorted(year_values)
+        valid_years = sorted(bs_years & is_years)
+        
+        # 주요 지표 계산
+        revenue = np.array([float(year_values[y].get('매출액', 0)) for y in valid_years], dtype=np.float64)
+        net_income = np.array([float(year_values[y].get('당기순이익', 0)) for y in valid_years], dtype=np.float64)
+        total_assets = np.array([float(year_values[y].get('자산총계', 0)) for y in valid_years], dtype=np.float64)
+        total_equity = np.array([float(year_values[y].get('자본총계', 0)) for y in valid_years], dtype=np.float64)
+        roe = percent_ratios(net_income, total_equity)
+        roa = percent_ratios(net_income, total_assets)
+        
+        key_metrics = {
+            year: {
+                'revenue': float(revenue[i]),
+                'net_income': float(net_income[i]),
+                'total_assets': float(total_assets[i]),
+                'total_equity': float(total_equity[i]),
+                'roe': float(roe[i]),
+                'roa': float(roa[i])
+            }
+            for i, year in enumerate(valid_years)
+        }
+        
+        return years, key_metrics
+    
+    def run(self, debug: bool = False, host: str = '0.0.0.0', port: int = 8080):
         """애플리케이션 실행"""
-        print("🚀 재무제표 시각화 웹 애플리케이션 시작...")
-        print(f"   - URL: http://{host}:{port}")
+        logger.info("🚀 재무제표 시각화 웹 애플리케이션 시작...")
+        logger.info("   - URL: http://%s:%s", host, port)
         self.app.run(debug=debug, host=host, port=port)
 
 
@@ -301,12 +479,18 @@ def main():
     
     # 애플리케이션 초기화
     if not app.initialize():
-        print("❌ 애플리케이션을 시작할 수 없습니다.")
+        logger.error("❌ 애플리케이션을 시작할 수 없습니다.")
         return
     
     # 애플리케이션 실행
     app.run()
 
+# 로그 설정 (기본 INFO, LOG_LEVEL 환경 변수로 조정)
+logging.basicConfig(
+    level=os.getenv('LOG_LEVEL', 'INFO').upper(),
+    format='%(asctime)s [%(levelname)s] %(name)s: %(message)s'
+)
+
 # Render 배포를 위한 애플리케이션 인스턴스
 main_app = FinancialDashboardApp()
 if main_app.initialize():
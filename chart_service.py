@@ -4,12 +4,81 @@
 차트 생성 서비스
 """
 
-import pandas as pd
+import logging
+import threading
+from bisect import bisect_left
+import numpy as np
 import plotly.graph_objects as go
 import plotly.express as px
 from plotly.subplots import make_subplots
-from typing import Any, Dict, List, Optional, Tuple
-from utils import format_amount, safe_convert
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+from cachetools import LRUCache
+from utils import format_amount_array, percent_ratios, safe_convert, safe_convert_array
+
+logger = logging.getLogger(__name__)
+
+
+# Y축 틱 테이블 (조 단위): 최댓값이 상한 이하인 첫 구간의 틱을 사용
+_TICK_LIMITS = [100, 200, 500, 1000]
+_TICK_TABLE = [
+    [0, 25, 50, 75, 100],
+    [0, 50, 100, 150, 200],
+    [0, 100, 200, 300, 400, 500],
+    [0, 200, 400, 600, 800, 1000],
+    [0, 500, 1000, 1500, 2000],
+]
+_TICK_TEXT_TABLE = [[f"{val}조" for val in tick_vals] for tick_vals in _TICK_TABLE]
+
+
+# 수익성 레이더 차트 비율 정의: (표시 이름, 계산 공식, 분자 계정, 분모 계정)
+_RATIO_SPECS = (
+    ('ROE<br>(자기자본이익률)', '당기순이익 / 자본총계', '당기순이익', '자본총계'),
+    ('ROA<br>(총자산이익률)', '당기순이익 / 자산총계', '당기순이익', '자산총계'),
+    ('영업이익률', '영업이익 / 매출액', '영업이익', '매출액'),
+    ('순이익률', '당기순이익 / 매출액', '당기순이익', '매출액'),
+)
+
+
+def _pick_ticks(max_val: int) -> Tuple[List[int], List[str]]:
+    """최댓값(조 단위)에 맞는 Y축 틱 값과 라벨 선택"""
+    index = bisect_left(_TICK_LIMITS, max_val)
+    return _TICK_TABLE[index], _TICK_TEXT_TABLE[index]
+
+
+def _extract_key_accounts(
+    data: List[Dict[str, Any]],
+    key_accounts: List[str]
+) -> Tuple[List[str], np.ndarray, np.ndarray]:
+    """주요 계정과목의 당기/전기 금액을 한 번의 순회로 추출 (계정명 기준 첫 번째 항목 사용)"""
+    found = {}
+    for item in data:
+        account_name = item.get('account_nm')
+        if account_name in key_accounts and account_name not in found:
+            found[account_name] = item
+            if len(found) == len(key_accounts):
+                break
+    
+    account_names = [account_name for account_name in key_accounts if account_name in found]
+    
+    # 당기/전기 금액을 한 번에 숫자로 변환
+    amounts = safe_convert_array(
+        [found[name].get('thstrm_amount', 0) for name in account_names] +
+        [found[name].get('frmtrm_amount', 0) for name in account_names]
+    )
+    count = len(account_names)
+    return account_names, amounts[:count], amounts[count:]
+
+
+def _extract_amounts(rows: List[Dict[str, Any]], keys: Set[str]) -> Dict[str, float]:
+    """필요한 계정과목의 당기 금액만 추출 (계정명이 중복되면 마지막 항목 사용)"""
+    amounts = {}
+    for item in reversed(rows):
+        account_name = item.get('account_nm')
+        if account_name in keys and account_name not in amounts:
+            amounts[account_name] = safe_convert(item.get('thstrm_amount', 0))
+            if len(amounts) == len(keys):
+                break
+    return amounts
 
 
 class ChartService:
@@ -17,13 +86,62 @@ class ChartService:
     
     def __init__(self):
         self.chart_config = {
-            'modebar': dict(remove=[
+            'modebar': {'remove': [
                 'pan', 'select', 'lasso2d', 'autoScale2d', 
                 'hoverClosestCartesian', 'hoverCompareCartesian', 'toggleSpikelines'
-            ]),
+            ]},
             'paper_bgcolor': '#004060',
             'plot_bgcolor': '#004060',
-            'font': dict(color='#e0e0e0')
+            'font': {'color': '#e0e0e0'}
+        }
+        
+        # 모든 차트에 공통으로 적용되는 레이아웃을 미리 생성 (차트마다 병합하지 않도록)
+        self._base_layout = go.Layout(**self.chart_config)
+        self._table_layout = go.Layout(
+            title='',
+            height=150,
+            margin={'l': 10, 'r': 10, 't': 20, 'b': 10},
+            **self.chart_config
+        )
+        
+        # 요약 테이블은 셀 값만 달라지므로 그림 데이터를 한 번만 만들어 두고 셀 값만 교체
+        self._table_template = go.Figure(data=[go.Table(
+            header={
+                'values': ['', '당기', '전기', '증감'],
+                'fill_color': '#002040',
+                'font': {'color': '#e0e0e0', 'size': 12},
+                'align': 'center'
+            },
+            cells={
+                'values': [[], [], [], []],
+                'fill_color': '#004060',
+                'font': {'color': '#e0e0e0', 'size': 10},
+                'align': 'center',
+                'height': 30
+            }
+        )], layout=self._table_layout).to_plotly_json()
+        
+        # 차트 그림 캐시 (차트 종류 + 입력값 -> Plotly 그림 데이터)
+        # 그림 데이터는 dict로 반환되어 응답 직렬화(orjson) 단계에서 한 번만 인코딩되므로 plotly JSON 엔진은 사용하지 않음
+        self._figure_cache = LRUCache(maxsize=256)
+        self._figure_cache_lock = threading.Lock()
+    
+    def _cached_figures(self, key: Tuple[Any, ...], build: Callable[[], Dict[str, Any]]) -> Dict[str, Any]:
+        """같은 입력값의 차트는 그림 생성과 변환 없이 캐시된 결과 재사용"""
+        with self._figure_cache_lock:
+            charts = self._figure_cache.get(key)
+        if charts is None:
+            charts = build()
+            with self._figure_cache_lock:
+                self._figure_cache[key] = charts
+        return charts
+    
+    def _table_figure(self, columns: List[List[str]]) -> Dict[str, Any]:
+        """요약 테이블 템플릿에 셀 값을 채운 그림 데이터 생성 (템플릿은 변경하지 않음)"""
+        table = self._table_template['data'][0]
+        return {
+            'data': [{**table, 'cells': {**table['cells'], 'values': columns}}],
+            'layout': self._table_template['layout']
         }
     
     def create_balance_sheet_chart(self, bs_data: List[Dict[str, Any]]) -> Dict[str, Any]:
@@ -31,76 +149,58 @@ class ChartService:
         if not bs_data:
             return {}
         
-        # 주요 계정과목만 필터링 및 중복 제거
+        # 주요 계정과목의 당기/전기 금액 추출 (계정명 기준 첫 번째 항목 사용)
         key_accounts = ['자산총계', '부채총계', '자본총계']
-        filtered_data = [item for item in bs_data if item.get('account_nm') in key_accounts]
+        account_names, current_amounts, previous_amounts = _extract_key_accounts(bs_data, key_accounts)
         
-        if not filtered_data:
+        if not account_names:
             return {}
         
-        # 중복 제거 - 계정명 기준으로 첫 번째 항목만 사용
-        unique_data = {}
-        for item in filtered_data:
-            account_name = item.get('account_nm', '')
-            if account_name not in unique_data:
-                unique_data[account_name] = item
-        
-        # 데이터 준비
-        account_names = []
-        current_amounts = []
-        previous_amounts = []
-        
-        for account_name in key_accounts:
-            if account_name in unique_data:
-                item = unique_data[account_name]
-                account_names.append(account_name)
-                current_amounts.append(safe_convert(item.get('thstrm_amount', 0)))
-                previous_amounts.append(safe_convert(item.get('frmtrm_amount', 0)))
+        key = ('balance_sheet', tuple(account_names), current_amounts.tobytes(), previous_amounts.tobytes())
+        return self._cached_figures(key, lambda: self._build_balance_sheet_figures(account_names, current_amounts, previous_amounts))
+    
+    def _build_balance_sheet_figures(
+        self, 
+        account_names: List[str], 
+        current_amounts: np.ndarray, 
+        previous_amounts: np.ndarray
+    ) -> Dict[str, Any]:
+        """재무상태표 막대그래프 + 텍스트 테이블 그림 데이터 생성"""
+        # 막대 텍스트와 테이블에서 함께 사용할 포맷팅 결과
+        current_texts = format_amount_array(current_amounts)
+        previous_texts = format_amount_array(previous_amounts)
+        change_texts = format_amount_array(current_amounts - previous_amounts)
         
         # 막대그래프 생성
-        fig = go.Figure()
+        fig = go.Figure(layout=self._base_layout)
         
         # 조 단위로 변환
-        current_amounts_cho = [amount / 1000000000000 for amount in current_amounts]
-        previous_amounts_cho = [amount / 1000000000000 for amount in previous_amounts]
+        current_amounts_cho = current_amounts / 1000000000000
+        previous_amounts_cho = previous_amounts / 1000000000000
         
         # Y축 범위 계산
-        all_amounts = current_amounts_cho + previous_amounts_cho
-        max_amount = max(all_amounts) if all_amounts else 100
-        min_amount = min(all_amounts) if all_amounts else 0
+        max_amount = np.max((current_amounts_cho, previous_amounts_cho))
         
         # Y축 틱 값 생성 (조 단위) - 100 단위로 깔끔하게
-        max_val = int(max_amount)
-        if max_val <= 100:
-            tick_vals = [0, 25, 50, 75, 100]
-        elif max_val <= 200:
-            tick_vals = [0, 50, 100, 150, 200]
-        elif max_val <= 500:
-            tick_vals = [0, 100, 200, 300, 400, 500]
-        elif max_val <= 1000:
-            tick_vals = [0, 200, 400, 600, 800, 1000]
-        else:
-            tick_vals = [0, 500, 1000, 1500, 2000]
-        
-        tick_texts = [f"{val}조" for val in tick_vals]
+        tick_vals, tick_texts = _pick_ticks(int(max_amount))
         
         fig.add_trace(go.Bar(
             name='당기',
             x=account_names,
-            y=current_amounts_cho,
+            y=current_amounts_cho.tolist(),
             marker_color='rgb(55, 83, 109)',
             hovertemplate='<b>%{x}</b><br>당기: %{text}<extra></extra>',
-            text=[format_amount(str(int(amount))) for amount in current_amounts],
+            text=current_texts,
             textposition='outside'
         ))
         
         fig.add_trace(go.Bar(
             name='전기',
             x=account_names,
-            y=previous_amounts_cho,
+            y=previous_amounts_cho.tolist(),
             marker_color='rgb(26, 118, 255)',
             hovertemplate='<b>%{x}</b><br>전기: %{text}<extra></extra>',
-            text=[format_amount(str(int(amount))) for amount in previous_amounts],
+            text=previous_texts,
             textposition='outside'
         ))
         
@@ -110,48 +210,21 @@ class ChartService:
             yaxis_title='',
             barmode='group',
             height=450,
-            margin=dict(l=50, r=50, t=80, b=80),
-            yaxis=dict(
-                tickformat='.0f',
-                tickmode='array',
-                ticktext=tick_texts,
-                tickvals=tick_vals
-            ),
-            **self.chart_config
+            margin={'l': 50, 'r': 50, 't': 80, 'b': 80},
+            yaxis={
+                'tickformat': '.0f',
+                'tickmode': 'array',
+                'ticktext': tick_texts,
+                'tickvals': tick_vals
+            }
         )
         
         # 텍스트 테이블 생성
-        table_fig = go.Figure(data=[go.Table(
-            header=dict(
-                values=['', '당기', '전기', '증감'],
-                fill_color='#002040',
-                font=dict(color='#e0e0e0', size=12),
-                align='center'
-            ),
-            cells=dict(
-                values=[
-                    account_names,
-                    [format_amount(str(int(amount))) for amount in current_amounts],
-                    [format_amount(str(int(amount))) for amount in previous_amounts],
-                    [format_amount(str(int(current - previous))) for current, previous in zip(current_amounts, previous_amounts)]
-                ],
-                fill_color='#004060',
-                font=dict(color='#e0e0e0', size=10),
-                align='center',
-                height=30
-            )
-        )])
-        
-        table_fig.update_layout(
-            title='',
-            height=150,
-            margin=dict(l=10, r=10, t=20, b=10),
-            **self.chart_config
-        )
+        table_figure = self._table_figure([account_names, current_texts, previous_texts, change_texts])
         
         return {
-            'balance_sheet': fig.to_html(full_html=False, include_plotlyjs=False),
-            'balance_sheet_table': table_fig.to_html(full_html=False, include_plotlyjs=False)
+            'balance_sheet': fig.to_plotly_json(),
+            'balance_sheet_table': table_figure
         }
     
     def create_income_statement_chart(self, is_data: List[Dict[str, Any]]) -> Dict[str, Any]:
@@ -159,76 +232,58 @@ class ChartService:
         if not is_data:
             return {}
         
-        # 주요 계정과목만 필터링 및 중복 제거
+        # 주요 계정과목의 당기/전기 금액 추출 (계정명 기준 첫 번째 항목 사용)
         key_accounts = ['매출액', '영업이익', '당기순이익']
-        filtered_data = [item for item in is_data if item.get('account_nm') in key_accounts]
+        account_names, current_amounts, previous_amounts = _extract_key_accounts(is_data, key_accounts)
         
-        if not filtered_data:
+        if not account_names:
             return {}
         
-        # 중복 제거 - 계정명 기준으로 첫 번째 항목만 사용
-        unique_data = {}
-        for item in filtered_data:
-            account_name = item.get('account_nm', '')
-            if account_name not in unique_data:
-                unique_data[account_name] = item
-        
-        # 데이터 준비
-        account_names = []
-        current_amounts = []
-        previous_amounts = []
-        
-        for account_name in key_accounts:
-            if account_name in unique_data:
-                item = unique_data[account_name]
-                account_names.append(account_name)
-                current_amounts.append(safe_convert(item.get('thstrm_amount', 0)))
-                previous_amounts.append(safe_convert(item.get('frmtrm_amount', 0)))
+        key = ('income_statement', tuple(account_names), current_amounts.tobytes(), previous_amounts.tobytes())
+        return self._cached_figures(key, lambda: self._build_income_statement_figures(account_names, current_amounts, previous_amounts))
+    
+    def _build_income_statement_figures(
+        self, 
+        account_names: List[str], 
+        current_amounts: np.ndarray, 
+        previous_amounts: np.ndarray
+    ) -> Dict[str, Any]:
+        """손익계산서 막대그래프 + 텍스트 테이블 그림 데이터 생성"""
+        # 막대 텍스트와 테이블에서 함께 사용할 포맷팅 결과
+        current_texts = format_amount_array(current_amounts)
+        previous_texts = format_amount_array(previous_amounts)
+        change_texts = format_amount_array(current_amounts - previous_amounts)
         
         # 막대그래프 생성
-        fig = go.Figure()
+        fig = go.Figure(layout=self._base_layout)
         
         # 조 단위로 변환
-        current_amounts_cho = [amount / 1000000000000 for amount in current_amounts]
-        previous_amounts_cho = [amount / 1000000000000 for amount in previous_amounts]
+        current_amounts_cho = current_amounts / 1000000000000
+        previous_amounts_cho = previous_amounts / 1000000000000
         
         # Y축 범위 계산
-        all_amounts = current_amounts_cho + previous_amounts_cho
-        max_amount = max(all_amounts) if all_amounts else 100
-        min_amount = min(all_amounts) if all_amounts else 0
+        max_amount = np.max((current_amounts_cho, previous_amounts_cho))
         
         # Y축 틱 값 생성 (조 단위) - 100 단위로 깔끔하게
-        max_val = int(max_amount)
-        if max_val <= 100:
-            tick_vals = [0, 25, 50, 75, 100]
-        elif max_val <= 200:
-            tick_vals = [0, 50, 100, 150, 200]
-        elif max_val <= 500:
-            tick_vals = [0, 100, 200, 300, 400, 500]
-        elif max_val <= 1000:
-            tick_vals = [0, 200, 400, 600, 800, 1000]
-        else:
-            tick_vals = [0, 500, 1000, 1500, 2000]
-        
-        tick_texts = [f"{val}조" for val in tick_vals]
+        tick_vals, tick_texts = _pick_ticks(int(max_amount))
         
         fig.add_trace(go.Bar(
             name='당기',
             x=account_names,
-            y=current_amounts_cho,
+            y=current_amounts_cho.tolist(),
             marker_color='rgb(158, 202, 225)',
             hovertemplate='<b>%{x}</b><br>당기: %{text}<extra></extra>',
-            text=[format_amount(str(int(amount))) for amount in current_amounts],
+            text=current_texts,
             textposition='outside'
         ))
         
         fig.add_trace(go.Bar(
             name='전기',
             x=account_names,
-            y=previous_amounts_cho,
+            y=previous_amounts_cho.tolist(),
             marker_color='rgb(94, 158, 217)',
             hovertemplate='<b>%{x}</b><br>전기: %{text}<extra></extra>',
-            text=[format_amount(str(int(amount))) for amount in previous_amounts],
+            text=previous_texts,
             textposition='outside'
         ))
         
@@ -238,48 +293,21 @@ class ChartService:
             yaxis_title='',
             barmode='group',
             height=450,
-            margin=dict(l=50, r=50, t=80, b=80),
-            yaxis=dict(
-                tickformat='.0f',
-                tickmode='array',
-                ticktext=tick_texts,
-                tickvals=tick_vals
-            ),
-            **self.chart_config
+            margin={'l': 50, 'r': 50, 't': 80, 'b': 80},
+            yaxis={
+                'tickformat': '.0f',
+                'tickmode': 'array',
+                'ticktext': tick_texts,
+                'tickvals': tick_vals
+            }
         )
         
         # 텍스트 테이블 생성
-        table_fig = go.Figure(data=[go.Table(
-            header=dict(
-                values=['', '당기', '전기', '증감'],
-                fill_color='#002040',
-                font=dict(color='#e0e0e0', size=12),
-                align='center'
-            ),
-            cells=dict(
-                values=[
-                    account_names,
-                    [format_amount(str(int(amount))) for amount in current_amounts],
-                    [format_amount(str(int(amount))) for amount in previous_amounts],
-                    [format_amount(str(int(current - previous))) for current, previous in zip(current_amounts, previous_amounts)]
-                ],
-                fill_color='#004060',
-                font=dict(color='#e0e0e0', size=10),
-                align='center',
-                height=30
-            )
-        )])
-        
-        table_fig.update_layout(
-            title='',
-            height=150,
-            margin=dict(l=10, r=10, t=20, b=10),
-            **self.chart_config
-        )
+        table_figure = self._table_figure([account_names, current_texts, previous_texts, change_texts])
         
         return {
-            'income_statement': fig.to_html(full_html=False, include_plotlyjs=False),
-            'income_statement_table': table_fig.to_html(full_html=False, include_plotlyjs=False)
+            'income_statement': fig.to_plotly_json(),
+            'income_statement_table': table_figure
         }
     
     def create_profitability_radar_chart(
@@ -292,62 +320,37 @@ class ChartService:
             return {}
         
         # 데이터 준비
-        bs_dict = {item['account_nm']: item for item in bs_data}
-        is_dict = {item['account_nm']: item for item in is_data}
-        
-        # 재무비율 계산
-        ratios = []
-        ratio_names = []
-        account_names = []
-        numerator_amounts = []
-        base_amounts = []
-        
-        # ROE (당기순이익 / 자본총계)
-        net_income = safe_convert(is_dict.get('당기순이익', {}).get('thstrm_amount', 0))
-        total_equity = safe_convert(bs_dict.get('자본총계', {}).get('thstrm_amount', 0))
-        if total_equity > 0:
-            roe = (net_income / total_equity) * 100
-            ratios.append(roe)
-            ratio_names.append('ROE<br>(자기자본이익률)')
-            account_names.append('당기순이익 / 자본총계')
-            numerator_amounts.append(format_amount(str(int(net_income))))
-            base_amounts.append(format_amount(str(int(total_equity))))
-        
-        # ROA (당기순이익 / 자산총계)
-        total_assets = safe_convert(bs_dict.get('자산총계', {}).get('thstrm_amount', 0))
-        if total_assets > 0:
-            roa = (net_income / total_assets) * 100
-            ratios.append(roa)
-            ratio_names.append('ROA<br>(총자산이익률)')
-            account_names.append('당기순이익 / 자산총계')
-            numerator_amounts.append(format_amount(str(int(net_income))))
-            base_amounts.append(format_amount(str(int(total_assets))))
-        
-        # 영업이익률 (영업이익 / 매출액)
-        operating_income = safe_convert(is_dict.get('영업이익', {}).get('thstrm_amount', 0))
-        revenue = safe_convert(is_dict.get('매출액', {}).get('thstrm_amount', 0))
-        if revenue > 0:
-            operating_margin = (operating_income / revenue) * 100
-            ratios.append(operating_margin)
-            ratio_names.append('영업이익률')
-            account_names.append('영업이익 / 매출액')
-            numerator_amounts.append(format_amount(str(int(operating_income))))
-            base_amounts.append(format_amount(str(int(revenue))))
-        
-        # 순이익률 (당기순이익 / 매출액)
-        if revenue > 0:
-            net_margin = (net_income / revenue) * 100
-            ratios.append(net_margin)
-            ratio_names.append('순이익률')
-            account_names.append('당기순이익 / 매출액')
-            numerator_amounts.append(format_amount(str(int(net_income))))
-            base_amounts.append(format_amount(str(int(revenue))))
-        
-        if not ratios:
+        bs_amounts = _extract_amounts(bs_data, {'자본총계', '자산총계'})
+        is_amounts = _extract_amounts(is_data, {'당기순이익', '영업이익', '매출액'})
+        
+        key = ('profitability_radar', tuple(sorted(bs_amounts.items())), tuple(sorted(is_amounts.items())))
+        return self._cached_figures(key, lambda: self._build_profitability_radar_figures(bs_amounts, is_amounts))
+    
+    def _build_profitability_radar_figures(
+        self, 
+        bs_amounts: Dict[str, float], 
+        is_amounts: Dict[str, float]
+    ) -> Dict[str, Any]:
+        """수익성 분석 레이더 차트 그림 데이터 생성"""
+        # 분모가 양수인 비율만 계산
+        amounts = {**bs_amounts, **is_amounts}
+        specs = [spec for spec in _RATIO_SPECS if amounts.get(spec[3], 0.0) > 0]
+        if not specs:
             return {}
         
+        numerators = np.array([amounts.get(spec[2], 0.0) for spec in specs])
+        denominators = np.array([amounts[spec[3]] for spec in specs])
+        ratios = (numerators / denominators * 100).tolist()
+        ratio_names = [spec[0] for spec in specs]
+        
+        # 분자/분모 금액을 한 번에 포맷팅
+        formatted_amounts = format_amount_array(np.concatenate((numerators, denominators)))
+        numerator_amounts = formatted_amounts[:len(specs)]
+        base_amounts = formatted_amounts[len(specs):]
+        account_names = [spec[1] for spec in specs]
+        
         # 레이더 차트 생성
-        fig = go.Figure()
+        fig = go.Figure(layout=self._base_layout)
         
         fig.add_trace(go.Scatterpolar(
             r=ratios,
@@ -363,22 +366,21 @@ class ChartService:
         ))
         
         fig.update_layout(
-            polar=dict(
-                radialaxis=dict(
-                    visible=False,
-                    range=[0, max(ratios) * 1.2],
-                    showgrid=False
-                ),
-                bgcolor='#004060'
-            ),
+            polar={
+                'radialaxis': {
+                    'visible': False,
+                    'range': [0, max(ratios) * 1.2],
+                    'showgrid': False
+                },
+                'bgcolor': '#004060'
+            },
             showlegend=False,
             title='수익성 분석',
             height=550,
-            margin=dict(l=50, r=50, t=80, b=50),
-            **self.chart_config
+            margin={'l': 50, 'r': 50, 't': 80, 'b': 50}
         )
         
-        return {'profitability_radar': fig.to_html(full_html=False, include_plotlyjs=False)}
+        return {'profitability_radar': fig.to_plotly_json()}
     
     def create_combined_financial_ratios_chart(
         self, 
@@ -403,15 +405,19 @@ class ChartService:
         if not bs_data:
             return {}
         
-        bs_dict = {item['account_nm']: item for item in bs_data}
-        
         # 부채와 자본 데이터 추출
-        total_debt = safe_convert(bs_dict.get('부채총계', {}).get('thstrm_amount', 0))
-        total_equity = safe_convert(bs_dict.get('자본총계', {}).get('thstrm_amount', 0))
+        bs_amounts = _extract_amounts(bs_data, {'부채총계', '자본총계'})
+        total_debt = bs_amounts.get('부채총계', 0.0)
+        total_equity = bs_amounts.get('자본총계', 0.0)
         
         if total_debt == 0 and total_equity == 0:
             return {}
         
+        key = ('debt_ratio_donut', total_debt, total_equity)
+        return self._cached_figures(key, lambda: self._build_debt_ratio_donut_figures(total_debt, total_equity))
+    
+    def _build_debt_ratio_donut_figures(self, total_debt: float, total_equity: float) -> Dict[str, Any]:
+        """부채비율 도넛 차트 그림 데이터 생성"""
         # 도넛 차트 생성
         fig = go.Figure(data=[go.Pie(
             labels=['부채', '자본'],
@@ -419,48 +425,48 @@ class ChartService:
             hole=0.6,
             marker_colors=['#ff7f0e', '#2ca02c'],
             hovertemplate='<b>%{label}</b><br>금액: %{customdata}<br>비율: %{percent:.1%}<extra></extra>',
-            customdata=[format_amount(str(int(total_debt))), format_amount(str(int(total_equity)))]
-        )])
+            customdata=format_amount_array([total_debt, total_equity])
+        )], layout=self._base_layout)
         
         fig.update_layout(
             title='부채비율 분석',
-            height=500,
-            **self.chart_config
+            height=500
         )
         
-        return {'debt_ratio_donut': fig.to_html(full_html=False, include_plotlyjs=False)}
+        return {'debt_ratio_donut': fig.to_plotly_json()}
     
     def create_financial_charts(self, financial_data: List[Dict[str, Any]]) -> Dict[str, Any]:
         """재무제표 차트 생성 - 요청된 배치 순서로 생성"""
         if not financial_data:
-            print("❌ 재무 데이터가 없습니다.")
+            logger.warning("❌ 재무 데이터가 없습니다.")
             return {}
         
         # 재무상태표와 손익계산서 데이터 분리
         bs_data = [item for item in financial_data if item.get('sj_div') == 'BS']
         is_data = [item for item in financial_data if item.get('sj_div') == 'IS']
         
-        print(f"📊 BS 데이터: {len(bs_data)}개, IS 데이터: {len(is_data)}개")
+        logger.debug("📊 BS 데이터: %d개, IS 데이터: %d개", len(bs_data), len(is_data))
         
+        # 차트 생성은 순수 파이썬 연산(GIL)이라 스레드로 나눠도 빨라지지 않으므로 순서대로 생성
         charts = {}
         
         # 1. 재무상태표 차트 (막대그래프 + 텍스트 테이블)
         if bs_data:
-            print("📈 재무상태표 차트 생성 중...")
+            logger.debug("📈 재무상태표 차트 생성 중...")
             bs_chart = self.create_balance_sheet_chart(bs_data)
             charts.update(bs_chart)
-            print(f"✅ 재무상태표 차트 생성 완료: {len(bs_chart)}개")
+            logger.debug("✅ 재무상태표 차트 생성 완료: %d개", len(bs_chart))
         
         # 2. 손익계산서 차트 (막대그래프 + 텍스트 테이블)
         if is_data:
-            print("📈 손익계산서 차트 생성 중...")
+            logger.debug("📈 손익계산서 차트 생성 중...")
             is_chart = self.create_income_statement_chart(is_data)
             charts.update(is_chart)
-            print(f"✅ 손익계산서 차트 생성 완료: {len(is_chart)}개")
+            logger.debug("✅ 손익계산서 차트 생성 완료: %d개", len(is_chart))
         
         # 3. 주요 재무비율 차트 (수익성 분석 + 부채비율 분석)
         if bs_data and is_data:
-            print("📈 주요 재무비율 차트 생성 중...")
+            logger.debug("📈 주요 재무비율 차트 생성 중...")
             
             # 3-1. 수익성 분석 (방사형차트)
             profitability_chart = self.create_profitability_radar_chart(bs_data, is_data)
@@ -470,16 +476,9 @@ class ChartService:
             debt_ratio_chart = self.create_debt_ratio_donut_chart(bs_data)
             charts.update(debt_ratio_chart)
             
-            print(f"✅ 주요 재무비율 차트 생성 완료")
+            logger.debug("✅ 주요 재무비율 차트 생성 완료")
         
-        # 4. 나머지 요소들 (기존 통합 차트는 하위에 배치)
-        if bs_data and is_data:
-            print("📈 기타 재무비율 차트 생성 중...")
-            combined_charts = self.create_combined_financial_ratios_chart(bs_data, is_data)
-            charts.update(combined_charts)
-            print(f"✅ 기타 재무비율 차트 생성 완료: {len(combined_charts)}개")
-        
-        print(f"🎯 총 생성된 차트 수: {len(charts)}개")
+        logger.debug("🎯 총 생성된 차트 수: %d개", len(charts))
         return charts
     
     def create_period_charts(self, financial_data: List[Dict[str, Any]]) -> Dict[str, Any]:
@@ -487,24 +486,21 @@ class ChartService:
         if not financial_data:
             return {}
         
-        # 데이터프레임 생성
-        df = pd.DataFrame(financial_data)
-        
-        # 연도별 데이터 그룹화
+        # 연도별 데이터 그룹화 (행을 복사하지 않고 원본 레코드를 그대로 사용)
         year_data = {}
-        for _, row in df.iterrows():
-            year = row.get('bsns_year', '')
-            if year not in year_data:
-                year_data[year] = {'BS': [], 'IS': []}
+        for item in financial_data:
+            year = item.get('bsns_year', '')
+            buckets = year_data.get(year)
+            if buckets is None:
+                buckets = year_data[year] = {'BS': [], 'IS': []}
             
-            fs_div = row.get('fs_div', '')
-            if fs_div in ['BS', 'IS', 'CFS']:
+            fs_div = item.get('fs_div', '')
+            if fs_div == 'CFS':
                 # CFS 데이터는 BS와 IS 모두에 포함
-                if fs_div == 'CFS':
-                    year_data[year]['BS'].append(row.to_dict())
-                    year_data[year]['IS'].append(row.to_dict())
-                else:
-                    year_data[year][fs_div].append(row.to_dict())
+                buckets['BS'].append(item)
+                buckets['IS'].append(item)
+            elif fs_div in ('BS', 'IS'):
+                buckets[fs_div].append(item)
         
         charts = {}
         
@@ -523,8 +519,9 @@ class ChartService:
     def create_ratio_trend_chart(self, year_data: Dict[str, Any]) -> Dict[str, Any]:
         """재무비율 추이 차트 생성"""
         years = sorted(year_data.keys())
-        roe_values = []
-        roa_values = []
+        net_incomes = []
+        total_equities = []
+        total_assets = []
         
         for year in years:
             bs_data = year_data[year]['BS']
@@ -533,33 +530,39 @@ class ChartService:
             if not bs_data or not is_data:
                 continue
             
-            bs_dict = {item['account_nm']: item for item in bs_data}
-            is_dict = {item['account_nm']: item for item in is_data}
-            
-            # ROE 계산
-            net_income = safe_convert(is_dict.get('당기순이익', {}).get('thstrm_amount', 0))
-            total_equity = safe_convert(bs_dict.get('자본총계', {}).get('thstrm_amount', 0))
-            roe = (net_income / total_equity) * 100 if total_equity > 0 else 0
-            roe_values.append(roe)
-            
-            # ROA 계산
-            total_assets = safe_convert(bs_dict.get('자산총계', {}).get('thstrm_amount', 0))
-            roa = (net_income / total_assets) * 100 if total_assets > 0 else 0
-            roa_values.append(roa)
+            bs_amounts = _extract_amounts(bs_data, {'자본총계', '자산총계'})
+            is_amounts = _extract_amounts(is_data, {'당기순이익'})
+            net_incomes.append(is_amounts.get('당기순이익', 0.0))
+            total_equities.append(bs_amounts.get('자본총계', 0.0))
+            total_assets.append(bs_amounts.get('자산총계', 0.0))
         
-        if not roe_values:
+        if not net_incomes:
             return {}
         
+        # 전체 연도의 ROE, ROA를 한 번에 계산
+        roe_values = percent_ratios(net_incomes, total_equities).tolist()
+        roa_values = percent_ratios(net_incomes, total_assets).tolist()
+        
+        key = ('ratio_trend', tuple(years), tuple(roe_values), tuple(roa_values))
+        return self._cached_figures(key, lambda: self._build_ratio_trend_figures(years, roe_values, roa_values))
+    
+    def _build_ratio_trend_figures(
+        self, 
+        years: List[str], 
+        roe_values: List[float], 
+        roa_values: List[float]
+    ) -> Dict[str, Any]:
+        """재무비율 추이 차트 그림 데이터 생성"""
         # 추이 차트 생성
-        fig = go.Figure()
+        fig = go.Figure(layout=self._base_layout)
         
         fig.add_trace(go.Scatter(
             x=years,
             y=roe_values,
             mode='lines+markers',
             name='ROE (%)',
-            line=dict(color='rgb(55, 83, 109)', width=3),
-            marker=dict(size=8)
+            line={'color': 'rgb(55, 83, 109)', 'width': 3},
+            marker={'size': 8}
         ))
         
         fig.add_trace(go.Scatter(
@@ -567,19 +570,18 @@ class ChartService:
             y=roa_values,
             mode='lines+markers',
             name='ROA (%)',
-            line=dict(color='rgb(26, 118, 255)', width=3),
-            marker=dict(size=8)
+            line={'color': 'rgb(26, 118, 255)', 'width': 3},
+            marker={'size': 8}
         ))
         
         fig.update_layout(
             title='재무비율 추이',
             xaxis_title='연도',
             yaxis_title='비율 (%)',
-            height=400,
-            **self.chart_config
+            height=400
         )
         
-        return {'ratio_trend': fig.to_html(full_html=False, include_plotlyjs=False)}
+        return {'ratio_trend': fig.to_plotly_json()}
     
     def create_indicator_trend_chart(self, year_data: Dict[str, Any]) -> Dict[str, Any]:
         """주요 지표 추이 차트 생성"""
@@ -593,10 +595,9 @@ class ChartService:
             if not is_data:
                 continue
             
-            is_dict = {item['account_nm']: item for item in is_data}
-            
-            revenue = safe_convert(is_dict.get('매출액', {}).get('thstrm_amount', 0))
-            net_income = safe_convert(is_dict.get('당기순이익', {}).get('thstrm_amount', 0))
+            is_amounts = _extract_amounts(is_data, {'매출액', '당기순이익'})
+            revenue = is_amounts.get('매출액', 0.0)
+            net_income = is_amounts.get('당기순이익', 0.0)
             
             revenue_values.append(revenue)
             net_income_values.append(net_income)
@@ -604,16 +605,26 @@ class ChartService:
         if not revenue_values:
             return {}
         
+        key = ('indicator_trend', tuple(years), tuple(revenue_values), tuple(net_income_values))
+        return self._cached_figures(key, lambda: self._build_indicator_trend_figures(years, revenue_values, net_income_values))
+    
+    def _build_indicator_trend_figures(
+        self, 
+        years: List[str], 
+        revenue_values: List[float], 
+        net_income_values: List[float]
+    ) -> Dict[str, Any]:
+        """주요 지표 추이 차트 그림 데이터 생성"""
         # 추이 차트 생성
-        fig = go.Figure()
+        fig = go.Figure(layout=self._base_layout)
         
         fig.add_trace(go.Scatter(
             x=years,
             y=revenue_values,
             mode='lines+markers',
             name='매출액',
-            line=dict(color='rgb(158, 202, 225)', width=3),
-            marker=dict(size=8)
+            line={'color': 'rgb(158, 202, 225)', 'width': 3},
+            marker={'size': 8}
         ))
         
         fig.add_trace(go.Scatter(
@@ -621,16 +632,15 @@ class ChartService:
             y=net_income_values,
             mode='lines+markers',
             name='당기순이익',
-            line=dict(color='rgb(94, 158, 217)', width=3),
-            marker=dict(size=8)
+            line={'color': 'rgb(94, 158, 217)', 'width': 3},
+            marker={'size': 8}
         ))
         
         fig.update_layout(
             title='주요 지표 추이',
             xaxis_title='연도',
             yaxis_title='금액',
-            height=400,
-            **self.chart_config
+            height=400
         )
         
-        return {'indicator_trend': fig.to_html(full_html=False, include_plotlyjs=False)} 
\ No newline at end of file
+        return {'indicator_trend': fig.to_plotly_json()} 
\ No newline at end of file
@@ -4,7 +4,10 @@
 재무 데이터 처리 서비스
 """
 
-from typing import Any, Dict, List, Optional, Tuple
+import logging
+import threading
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from cachetools import TTLCache
 from opendart_client import OpenDartClient
 from utils import (
     create_user_friendly_error_message, 
@@ -12,12 +15,41 @@ from utils import (
     format_financial_data_for_display
 )
 
+logger = logging.getLogger(__name__)
+
 
 class FinancialDataService:
     """재무 데이터 처리 서비스 클래스"""
     
     def __init__(self, opendart_client: OpenDartClient):
         self.opendart_client = opendart_client
+        
+        # 재무 데이터 캐시 (공시된 보고서는 변경되지 않으므로 하루 동안 재사용)
+        self._cache = TTLCache(maxsize=10_000, ttl=86_400)
+        self._cache_lock = threading.Lock()
+    
+    def _get_cached(
+        self, 
+        key: Tuple[str, ...], 
+        fetch: Callable[[], Tuple[Optional[List[Dict[str, Any]]], Optional[str]]],
+        is_complete: Optional[Callable[[List[Dict[str, Any]]], bool]] = None
+    ) -> Tuple[Optional[List[Dict[str, Any]]], Optional[str]]:
+        """재무 데이터 캐시 조회, 없으면 fetch() 결과를 저장 (오류 응답과 is_complete가 False인 결과는 저장하지 않음)"""
+        with self._cache_lock:
+            financial_data = self._cache.get(key)
+        if financial_data is not None:
+            return financial_data, None
+        
+        financial_data, error_message = fetch()
+        if financial_data and (is_complete is None or is_complete(financial_data)):
+            with self._cache_lock:
+                self._cache[key] = financial_data
+        return financial_data, error_message
+    
+    def clear_cache(self) -> None:
+        """재무 데이터 캐시 비우기"""
+        with self._cache_lock:
+            self._cache.clear()
     
     def get_financial_data(
         self, 
@@ -27,31 +59,26 @@ class FinancialDataService:
     ) -> Optional[List[Dict[str, Any]]]:
         """재무제표 데이터 가져오기"""
         try:
-            print(f"🔍 재무제표 데이터 요청: corp_code={corp_code}, year={year}, report_code={report_code}")
+            logger.debug("🔍 재무제표 데이터 요청: corp_code=%s, year=%s, report_code=%s", corp_code, year, report_code)
             data = self.opendart_client.get_financial_info(corp_code, year, report_code)
             
-            print(f"📊 API 응답: {type(data)}")
-            if data:
-                print(f"📋 응답 키: {list(data.keys()) if isinstance(data, dict) else 'Not a dict'}")
-            
             if not data:
-                print("❌ API 응답이 비어있습니다.")
+                logger.warning("❌ API 응답이 비어있습니다.")
                 return None
             
-            if 'list' not in data:
-                print(f"❌ 'list' 키가 없습니다. 응답: {data}")
+            lst = data.get('list') if isinstance(data, dict) else None
+            if lst is None:
+                logger.warning("❌ 'list' 키가 없습니다. 응답: %s", data)
                 return None
             
-            if not data['list']:
-                print("❌ 'list' 데이터가 비어있습니다.")
+            if not lst:
+                logger.warning("❌ 'list' 데이터가 비어있습니다.")
                 return None
             
-            print(f"✅ 재무제표 데이터 가져오기 성공: {len(data['list'])}개 항목")
-            return data['list']
+            logger.debug("✅ 재무제표 데이터 가져오기 성공: %d개 항목", len(lst))
+            return lst
         except Exception as e:
-            print(f"❌ 재무제표 데이터 가져오기 오류: {e}")
-            import traceback
-            traceback.print_exc()
+            logger.exception("❌ 재무제표 데이터 가져오기 오류: %s", e)
             return None
     
     def get_financial_data_with_error_handling(
@@ -61,7 +88,18 @@ class FinancialDataService:
         report_code: str, 
         corp_name: str
     ) -> Tuple[Optional[List[Dict[str, Any]]], Optional[str]]:
-        """재무제표 데이터 가져오기 (에러 메시지 포함)"""
+        """재무제표 데이터 가져오기 (에러 메시지 포함, 캐시 사용)"""
+        key = (OpenDartClient.pad_corp_code(corp_code), year, report_code)
+        return self._get_cached(key, lambda: self._fetch_financial_data(corp_code, year, report_code, corp_name))
+    
+    def _fetch_financial_data(
+        self, 
+        corp_code: str, 
+        year: str, 
+        report_code: str, 
+        corp_name: str
+    ) -> Tuple[Optional[List[Dict[str, Any]]], Optional[str]]:
+        """재무제표 데이터 조회 (에러 메시지 포함)"""
         try:
             data = self.opendart_client.get_financial_info(corp_code, year, report_code)
             
@@ -72,8 +110,8 @@ class FinancialDataService:
                 return None, error_msg
             
             # API 오류 응답 처리 (status가 있는 경우)
-            if isinstance(data, dict) and 'status' in data and data.get('status') != '000':
-                status = data.get('status')
+            status = data.get('status') if isinstance(data, dict) else None
+            if status is not None and status != '000':
                 message = data.get('message', '')
                 
                 error_msg = create_user_friendly_error_message(
@@ -81,16 +119,17 @@ class FinancialDataService:
                 )
                 return None, error_msg
             
-            if 'list' not in data:
+            lst = data.get('list') if isinstance(data, dict) else None
+            if lst is None:
                 return None, f"API 응답 형식 오류: {data}"
             
-            if not data['list']:
+            if not lst:
                 error_msg = create_user_friendly_error_message(
                     corp_name, corp_code, year, report_code
                 )
                 return None, error_msg
             
-            return data['list'], None
+            return lst, None
         except Exception as e:
             return None, f"재무제표 데이터 가져오기 오류: {e}"
     
@@ -102,7 +141,31 @@ class FinancialDataService:
         report_code: str, 
         corp_name: str
     ) -> Tuple[Optional[List[Dict[str, Any]]], Optional[str]]:
-        """기간별 재무제표 데이터 가져오기 (에러 메시지 포함)"""
+        """기간별 재무제표 데이터 가져오기 (에러 메시지 포함, 캐시 사용)"""
+        key = (OpenDartClient.pad_corp_code(corp_code), start_year, end_year, report_code)
+        
+        # 일부 연도가 빠진 결과(일시적 오류, 아직 공시되지 않은 보고서)는 저장하지 않고 다음 요청에서 다시 조회
+        return self._get_cached(
+            key,
+            lambda: self._fetch_financial_data_range(corp_code, start_year, end_year, report_code, corp_name),
+            lambda financial_data: self._covers_years(financial_data, start_year, end_year)
+        )
+    
+    @staticmethod
+    def _covers_years(financial_data: List[Dict[str, Any]], start_year: str, end_year: str) -> bool:
+        """기간 내 모든 연도의 데이터가 있는지 확인 (조회가 성공한 뒤에만 호출되므로 연도는 숫자)"""
+        found_years = {item.get('bsns_year') for item in financial_data}
+        return all(str(year) in found_years for year in range(int(start_year), int(end_year) + 1))
+    
+    def _fetch_financial_data_range(
+        self, 
+        corp_code: str, 
+        start_year: str, 
+        end_year: str, 
+        report_code: str, 
+        corp_name: str
+    ) -> Tuple[Optional[List[Dict[str, Any]]], Optional[str]]:
+        """기간별 재무제표 데이터 조회 (에러 메시지 포함)"""
         try:
             data = self.opendart_client.get_financial_info_range(corp_code, start_year, end_year, report_code)
             
@@ -113,8 +176,8 @@ class FinancialDataService:
                 return None, error_msg
             
             # API 오류 응답 처리 (status가 있는 경우)
-            if isinstance(data, dict) and 'status' in data and data.get('status') != '000':
-                status = data.get('status')
+            status = data.get('status') if isinstance(data, dict) else None
+            if status is not None and status != '000':
                 message = data.get('message', '')
                 
                 error_msg = create_user_friendly_error_message(
@@ -122,16 +185,17 @@ class FinancialDataService:
                 )
                 return None, error_msg
             
-            if 'list' not in data:
+            lst = data.get('list') if isinstance(data, dict) else None
+            if lst is None:
                 return None, f"API 응답 형식 오류: {data}"
             
-            if not data['list']:
+            if not lst:
                 error_msg = create_user_friendly_error_message(
                     corp_name, corp_code, f"{start_year}-{end_year}", report_code
                 )
                 return None, error_msg
             
-            return data['list'], None
+            return lst, None
         except Exception as e:
             return None, f"기간별 재무제표 데이터 가져오기 오류: {e}"
     
@@ -0,0 +1,28 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Gunicorn 설정 (gunicorn 실행 시 현재 디렉터리에서 자동으로 로드됨)
+"""
+
+import gc
+import os
+
+# Render 등 배포 환경에서 지정한 포트로 바인딩
+bind = f"0.0.0.0:{os.getenv('PORT', '8080')}"
+
+# OpenDart 응답을 기다리는 동안 다른 요청을 처리할 수 있도록 스레드 워커 사용
+# (뷰와 OpenDart 클라이언트가 동기 방식이므로 asyncio/uvloop 기반 워커는 이점이 없음)
+worker_class = 'gthread'
+workers = int(os.getenv('WEB_CONCURRENCY', '2'))
+threads = int(os.getenv('GUNICORN_THREADS', '8'))
+
+# 기간별 조회는 여러 연도를 요청하므로 기본값(30초)보다 여유 있게 설정
+timeout = 60
+
+# 회사코드 데이터베이스를 마스터에서 한 번만 로드하고 워커는 fork로 공유 (copy-on-write)
+preload_app = True
+
+
+def when_ready(server):
+    """워커 fork 직전: 로드된 객체를 GC 대상에서 제외해 공유 메모리 페이지가 복사되지 않도록 함"""
+    gc.freeze()
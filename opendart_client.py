@@ -1,9 +1,53 @@
+import json
+import logging
+import diskcache
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import pandas as pd
 import zipfile
+from io import BytesIO
 import xml.etree.ElementTree as ET
 import os
+import shutil
+import zlib
+from concurrent.futures import ThreadPoolExecutor
 from config import Config
+from utils import json_loads
+
+logger = logging.getLogger(__name__)
+
+# 파일 복사/체크섬 계산 시 읽기 단위 (1MiB)
+COPY_BUFFER_SIZE = 1 << 20
+
+# 회사코드 XML의 list 요소에서 읽는 필드
+CORP_CODE_FIELDS = ['corp_code', 'corp_name', 'corp_eng_name', 'stock_code', 'modify_date']
+
+# HTTP 요청 타임아웃 (연결, 응답 읽기) 초
+# 읽기 타임아웃은 재시도하지 않고 5xx 재시도는 2회까지만 하므로, 요청 하나의 최악 소요 시간은
+# 약 3 × (3.05 + 10)초 + 백오프로 gunicorn 워커 타임아웃(60초)보다 짧음
+REQUEST_TIMEOUT = (3.05, 10)
+
+# 기간별 조회 한 번에서 OpenDart로 동시에 보내는 최대 요청 수 (요청 제한 고려)
+MAX_CONCURRENT_REQUESTS = 5
+
+# 엔드포인트별 응답 디스크 캐시 유지 시간(초) - 공시된 재무정보와 회사코드 파일은 하루, 기업 기본정보는 1시간
+RESPONSE_CACHE_TTLS = {
+    'fnlttSinglAcnt.json': 86_400,
+    'corpCode.xml': 86_400,
+    'company.json': 3_600
+}
+
+def _matches_zip_member(path, zip_info):
+    """디스크의 파일이 ZIP 항목과 같은 내용인지 크기와 CRC-32로 확인"""
+    if not os.path.isfile(path) or os.path.getsize(path) != zip_info.file_size:
+        return False
+    
+    crc = 0
+    with open(path, 'rb') as f:
+        while chunk := f.read(COPY_BUFFER_SIZE):
+            crc = zlib.crc32(chunk, crc)
+    return crc == zip_info.CRC
 
 class OpenDartClient:
     """OpenDart API 클라이언트"""
@@ -11,49 +55,84 @@ class OpenDartClient:
     def __init__(self):
         """초기화 및 설정 검증"""
         Config.validate_config()
+        
+        # 설정값은 초기화 시 한 번만 읽어 인스턴스 속성으로 보관 (요청마다 Config를 조회하지 않음)
         self.api_key = Config.OPENDART_API_KEY
         self.base_url = Config.OPENDART_BASE_URL
         
+        # 요청마다 새로 연결하지 않도록 세션을 재사용 (keep-alive 연결 풀 + 일시적 서버 오류 재시도)
+        self.session = requests.Session()
+        retry = Retry(total=3, read=0, status=2, backoff_factor=0.3, status_forcelist=[500, 502, 503, 504], raise_on_status=False)
+        self.session.mount('https://', HTTPAdapter(pool_connections=4, pool_maxsize=16, max_retries=retry))
+        self.session.params = {'crtfc_key': self.api_key}
+        
         # data 폴더 생성
         self.data_dir = "data"
         if not os.path.exists(self.data_dir):
             os.makedirs(self.data_dir)
+        
+        # 성공한 API 응답 디스크 캐시 (워커 프로세스 간에 공유되고 재시작 후에도 유지, 최대 512MB)
+        self.response_cache = diskcache.Cache(os.path.join(self.data_dir, 'http_cache'), size_limit=512 << 20)
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+    
+    def close(self):
+        """HTTP 세션 및 응답 캐시 종료"""
+        self.session.close()
+        self.response_cache.close()
     
     def _make_request(self, endpoint, params=None, is_binary=False):
+        """API 요청 수행 (캐시 대상 엔드포인트는 디스크 캐시를 먼저 조회)"""
+        ttl = RESPONSE_CACHE_TTLS.get(endpoint)
+        if ttl is None:
+            return self._send_request(endpoint, params, is_binary)
+        
+        key = (endpoint, tuple(sorted((params or {}).items())), is_binary)
+        cached = self.response_cache.get(key)
+        if cached is not None:
+            logger.debug("💾 캐시된 응답 사용: %s %s", endpoint, params)
+            return cached
+        
+        data = self._send_request(endpoint, params, is_binary)
+        
+        # 정상 응답만 저장 (오류/데이터 없음 응답은 이후 공시될 수 있으므로 다시 조회)
+        if data and (is_binary or (isinstance(data, dict) and data.get('status') == '000')):
+            self.response_cache.set(key, data, expire=ttl)
+        return data
+    
+    def _send_request(self, endpoint, params=None, is_binary=False):
         """API 요청 수행"""
         url = f"{self.base_url}/{endpoint}"
         
-        # 기본 파라미터에 API 키 추가
-        if params is None:
-            params = {}
-        params['crtfc_key'] = self.api_key
-        
-        print(f"🌐 요청 URL: {url}")
-        print(f"🔑 API 키: {self.api_key[:10]}...")
+        # API 키는 세션 기본 파라미터(self.session.params)로 자동 추가됨
+        logger.debug("🌐 요청 URL: %s", url)
         
         try:
-            response = requests.get(url, params=params)
-            print(f"📡 HTTP 상태 코드: {response.status_code}")
+            response = self.session.get(url, params=params, timeout=REQUEST_TIMEOUT)
+            logger.debug("📡 HTTP 상태 코드: %s", response.status_code)
             
             if response.status_code != 200:
-                print(f"❌ HTTP 오류: {response.status_code}")
-                print(f"📄 응답 내용: {response.text[:500]}")
+                logger.warning("❌ HTTP 오류: %s", response.status_code)
+                logger.warning("📄 응답 내용: %s", response.content[:500].decode('utf-8', errors='replace'))
                 return None
             
             if is_binary:
                 return response.content
             else:
-                json_data = response.json()
-                print(f"✅ JSON 응답 타입: {type(json_data)}")
-                if isinstance(json_data, dict):
-                    print(f"📋 응답 키: {list(json_data.keys())}")
+                # 문자열로 디코딩하지 않고 바이트에서 바로 파싱 (orjson, 없으면 표준 json)
+                json_data = json_loads(response.content)
+                logger.debug("✅ JSON 응답 타입: %s", type(json_data).__name__)
                 return json_data
         except requests.exceptions.RequestException as e:
-            print(f"❌ API 요청 오류: {e}")
+            logger.warning("❌ API 요청 오류: %s", e)
             return None
         except ValueError as e:
-            print(f"❌ JSON 파싱 오류: {e}")
-            print(f"📄 응답 내용: {response.text[:500]}")
+            logger.warning("❌ JSON 파싱 오류: %s", e)
+            logger.warning("📄 응답 내용: %s", response.content[:500].decode('utf-8', errors='replace'))
             return None
     
     def download_corp_code_file(self, save_path=None):
@@ -61,17 +140,47 @@ class OpenDartClient:
         if save_path is None:
             save_path = os.path.join(self.data_dir, "corp_code.zip")
         
-        print("회사코드 파일 다운로드 중...")
-        zip_content = self._make_request('corpCode.xml', is_binary=True)
+        # 이전 다운로드의 ETag/Last-Modified가 있으면 조건부 요청으로 변경 여부만 확인
+        meta_path = f"{os.path.splitext(save_path)[0]}.meta.json"
+        headers = {}
+        if os.path.exists(save_path) and os.path.exists(meta_path):
+            try:
+                with open(meta_path, 'r', encoding='utf-8') as f:
+                    meta = json.load(f)
+                if meta.get('etag'):
+                    headers['If-None-Match'] = meta['etag']
+                if meta.get('last_modified'):
+                    headers['If-Modified-Since'] = meta['last_modified']
+            except (OSError, ValueError) as e:
+                logger.warning("회사코드 파일 메타 정보를 읽지 못했습니다: %s", e)
+        
+        logger.info("회사코드 파일 다운로드 중...")
+        try:
+            response = self.session.get(f"{self.base_url}/corpCode.xml", headers=headers, timeout=REQUEST_TIMEOUT)
+        except requests.exceptions.RequestException as e:
+            logger.warning("❌ API 요청 오류: %s", e)
+            response = None
+        
+        if response is not None and response.status_code == 304:
+            logger.info("회사코드 파일이 변경되지 않아 %s를 그대로 사용합니다.", save_path)
+            return save_path
         
-        if zip_content:
-            # ZIP 파일 저장
+        if response is not None and response.status_code == 200 and response.content:
+            # ZIP 파일과 다음 조건부 요청에 쓸 검증 헤더 저장
             with open(save_path, 'wb') as f:
-                f.write(zip_content)
-            print(f"회사코드 파일이 {save_path}에 저장되었습니다.")
+                f.write(response.content)
+            meta = {'etag': response.headers.get('ETag'), 'last_modified': response.headers.get('Last-Modified')}
+            if any(meta.values()):
+                with open(meta_path, 'w', encoding='utf-8') as f:
+                    json.dump(meta, f)
+            elif os.path.exists(meta_path):
+                os.remove(meta_path)
+            logger.info("회사코드 파일이 %s에 저장되었습니다.", save_path)
             return save_path
         else:
-            print("회사코드 파일 다운로드에 실패했습니다.")
+            if response is not None:
+                logger.warning("❌ HTTP 오류: %s", response.status_code)
+            logger.warning("회사코드 파일 다운로드에 실패했습니다.")
             return None
     
     def extract_corp_code_xml(self, zip_path=None, extract_path=None):
@@ -85,133 +194,192 @@ class OpenDartClient:
             with zipfile.ZipFile(zip_path, 'r') as zip_ref:
                 # ZIP 파일 내의 파일 목록 확인
                 file_list = zip_ref.namelist()
-                print(f"ZIP 파일 내 파일 목록: {file_list}")
+                logger.debug("ZIP 파일 내 파일 목록: %s", file_list)
                 
-                # XML 파일 추출
+                # XML 파일 추출 (이미 같은 내용의 파일이 있으면 그대로 사용)
                 for file_name in file_list:
                     if file_name.endswith('.xml'):
-                        zip_ref.extract(file_name, extract_path)
-                        xml_path = os.path.join(extract_path, file_name)
-                        print(f"XML 파일이 {xml_path}에 추출되었습니다.")
+                        xml_path = os.path.join(extract_path, os.path.basename(file_name))
+                        if _matches_zip_member(xml_path, zip_ref.getinfo(file_name)):
+                            logger.info("XML 파일이 이미 %s에 있어 추출을 건너뜁니다.", xml_path)
+                            return xml_path
+                        
+                        os.makedirs(extract_path, exist_ok=True)
+                        with zip_ref.open(file_name) as source, open(xml_path, 'wb') as target:
+                            shutil.copyfileobj(source, target, COPY_BUFFER_SIZE)
+                        logger.info("XML 파일이 %s에 추출되었습니다.", xml_path)
                         return xml_path
             
-            print("ZIP 파일에서 XML 파일을 찾을 수 없습니다.")
+            logger.warning("ZIP 파일에서 XML 파일을 찾을 수 없습니다.")
             return None
         except zipfile.BadZipFile:
-            print("잘못된 ZIP 파일입니다.")
+            logger.warning("잘못된 ZIP 파일입니다.")
             return None
         except Exception as e:
-            print(f"ZIP 파일 추출 중 오류 발생: {e}")
+            logger.exception("ZIP 파일 추출 중 오류 발생: %s", e)
             return None
     
-    def parse_corp_code_xml(self, xml_path):
-        """XML 파일을 파싱하여 회사 정보를 DataFrame으로 변환"""
-        try:
-            tree = ET.parse(xml_path)
-            root = tree.getroot()
+    def _iter_corp_code_rows(self, xml_source):
+        """XML(파일 경로 또는 파일 객체)에서 list 요소를 하나씩 읽어 CORP_CODE_FIELDS 순서의 튜플로 생성"""
+        context = ET.iterparse(xml_source, events=('start', 'end'))
+        _, root = next(context)
+        
+        # 종목코드/수정일은 중복 값이 대부분이므로 같은 문자열 객체를 공유
+        shared_values = {}
+        
+        for event, company in context:
+            if event != 'end' or company.tag != 'list':
+                continue
             
-            companies = []
-            for company in root.findall('.//list'):
-                company_info = {
-                    'corp_code': company.find('corp_code').text if company.find('corp_code') is not None else '',
-                    'corp_name': company.find('corp_name').text if company.find('corp_name') is not None else '',
-                    'corp_eng_name': company.find('corp_eng_name').text if company.find('corp_eng_name') is not None else '',
-                    'stock_code': company.find('stock_code').text if company.find('stock_code') is not None else '',
-                    'modify_date': company.find('modify_date').text if company.find('modify_date') is not None else ''
-                }
-                companies.append(company_info)
+            elements = map(company.find, CORP_CODE_FIELDS)
+            corp_code, corp_name, corp_eng_name, stock_code, modify_date = [
+                element.text if element is not None else '' for element in elements
+            ]
+            yield (
+                corp_code,
+                corp_name,
+                corp_eng_name,
+                shared_values.setdefault(stock_code, stock_code),
+                shared_values.setdefault(modify_date, modify_date)
+            )
             
-            df = pd.DataFrame(companies)
-            print(f"총 {len(df)}개의 회사 정보를 파싱했습니다.")
+            # 처리가 끝난 요소는 트리에서 제거해 메모리 사용량을 일정하게 유지
+            root.clear()
+    
+    def parse_corp_code_xml(self, xml_path):
+        """XML 파일(경로 또는 파일 객체)을 파싱하여 회사 정보를 DataFrame으로 변환 (list 요소 단위 스트리밍 파싱)"""
+        try:
+            df = pd.DataFrame.from_records(list(self._iter_corp_code_rows(xml_path)), columns=CORP_CODE_FIELDS)
+            logger.info("총 %d개의 회사 정보를 파싱했습니다.", len(df))
             return df
             
         except ET.ParseError as e:
-            print(f"XML 파싱 오류: {e}")
+            logger.warning("XML 파싱 오류: %s", e)
             return None
         except Exception as e:
-            print(f"파싱 중 오류 발생: {e}")
+            logger.exception("파싱 중 오류 발생: %s", e)
             return None
     
-    def get_corp_code_dataframe(self, save_csv=True, csv_path=None):
-        """회사코드 파일을 다운로드하고 DataFrame으로 반환"""
+    def parse_corp_code_zip(self, zip_content):
+        """메모리에 있는 ZIP 데이터에서 XML을 바로 열어 DataFrame으로 변환 (디스크 저장 없음)"""
+        try:
+            with zipfile.ZipFile(BytesIO(zip_content)) as zip_ref:
+                for file_name in zip_ref.namelist():
+                    if file_name.endswith('.xml'):
+                        with zip_ref.open(file_name) as xml_file:
+                            return self.parse_corp_code_xml(xml_file)
+            
+            logger.warning("ZIP 파일에서 XML 파일을 찾을 수 없습니다.")
+            return None
+        except zipfile.BadZipFile:
+            logger.warning("잘못된 ZIP 파일입니다.")
+            return None
+    
+    def get_corp_code_dataframe(self, save_csv=True, csv_path=None, persist=False):
+        """회사코드 파일을 다운로드하고 DataFrame으로 반환 (persist=True이면 ZIP/XML 파일도 저장)"""
         if csv_path is None:
             csv_path = os.path.join(self.data_dir, "corp_code.csv")
         
-        # 1. ZIP 파일 다운로드
-        zip_path = self.download_corp_code_file()
-        if not zip_path:
-            return None
-        
-        # 2. XML 파일 추출
-        xml_path = self.extract_corp_code_xml(zip_path)
-        if not xml_path:
-            return None
+        if persist:
+            # 1. ZIP 파일 다운로드
+            zip_path = self.download_corp_code_file()
+            if not zip_path:
+                return None
+            
+            # 2. XML 파일 추출
+            xml_path = self.extract_corp_code_xml(zip_path)
+            if not xml_path:
+                return None
+            
+            # 3. XML 파일 파싱
+            df = self.parse_corp_code_xml(xml_path)
+        else:
+            # 다운로드한 ZIP을 메모리에서 바로 파싱
+            logger.info("회사코드 파일 다운로드 중...")
+            zip_content = self._make_request('corpCode.xml', is_binary=True)
+            if not zip_content:
+                logger.warning("회사코드 파일 다운로드에 실패했습니다.")
+                return None
+            df = self.parse_corp_code_zip(zip_content)
         
-        # 3. XML 파일 파싱
-        df = self.parse_corp_code_xml(xml_path)
         if df is not None and save_csv:
             df.to_csv(csv_path, index=False, encoding='utf-8-sig')
-            print(f"회사 정보가 {csv_path}에 저장되었습니다.")
+            logger.info("회사 정보가 %s에 저장되었습니다.", csv_path)
         
         return df
     
+    @staticmethod
+    def pad_corp_code(corp_code):
+        """회사코드를 8자리 문자열로 패딩 (이미 8자리 문자열이면 새 문자열을 만들지 않고 그대로 반환)"""
+        return str(corp_code).zfill(8)
+    
     def get_company_info(self, corp_code):
         """기업 기본정보 조회"""
-        corp_code = str(corp_code).zfill(8)  # 8자리로 패딩
+        corp_code = self.pad_corp_code(corp_code)
         return self._make_request('company.json', {'corp_code': corp_code})
     
     def get_financial_info(self, corp_code, year, report_code):
         """재무정보 조회"""
         # OpenDart API 공식 문서에 따른 파라미터
-        corp_code = str(corp_code).zfill(8)  # 8자리로 패딩
+        corp_code = self.pad_corp_code(corp_code)
         params = {
             'corp_code': corp_code,
             'bsns_year': year,
             'reprt_code': report_code
         }
-        print(f"🔗 API 요청 URL: {self.base_url}/fnlttSinglAcnt.json")
-        print(f"📝 요청 파라미터: {params}")
+        logger.debug("🔗 API 요청 URL: %s/fnlttSinglAcnt.json", self.base_url)
+        logger.debug("📝 요청 파라미터: %s", params)
         return self._make_request('fnlttSinglAcnt.json', params)
     
     def get_financial_info_range(self, corp_code, start_year, end_year, report_code):
         """기간별 재무정보 조회"""
-        corp_code = str(corp_code).zfill(8)  # 8자리로 패딩
+        corp_code = self.pad_corp_code(corp_code)
         all_data = []
         successful_years = []
         
-        for year in range(int(start_year), int(end_year) + 1):
-            print(f"📅 {year}년 데이터 조회 중...")
+        # 연도별 요청을 호출마다 만든 스레드 풀로 동시에 보내고 결과는 연도 순서대로 취합
+        # (풀을 요청 간에 공유하지 않으므로 다른 요청의 조회를 기다리지 않음)
+        years = range(int(start_year), int(end_year) + 1)
+        with ThreadPoolExecutor(max_workers=max(1, min(MAX_CONCURRENT_REQUESTS, len(years))), thread_name_prefix='opendart') as executor:
+            futures = [
+                (year, executor.submit(self.get_financial_info, corp_code, str(year), report_code))
+                for year in years
+            ]
+        
+        for year, future in futures:
+            logger.debug("📅 %s년 데이터 조회 중...", year)
             try:
-                data = self.get_financial_info(corp_code, str(year), report_code)
+                data = future.result()
                 
                 # API 오류 응답 처리 (status가 있는 경우)
                 if isinstance(data, dict) and 'status' in data and data.get('status') != '000':
                     status = data.get('status')
                     message = data.get('message', '')
                     if status == '013' and '조회된 데이타가 없습니다' in message:
-                        print(f"⚠️ {year}년 데이터 없음 (API 응답: {message})")
+                        logger.warning("⚠️ %s년 데이터 없음 (API 응답: %s)", year, message)
                     else:
-                        print(f"❌ {year}년 데이터 조회 실패 (API 응답: {message})")
+                        logger.warning("❌ %s년 데이터 조회 실패 (API 응답: %s)", year, message)
                     continue
                 
                 if data and isinstance(data, dict) and 'list' in data and data['list']:
-                    # 연도 정보를 각 항목에 추가
+                    # 연도 정보를 각 항목에 추가 (연도 문자열은 한 번만 만들어 공유)
+                    year_str = str(year)
                     for item in data['list']:
-                        item['query_year'] = str(year)
-                        item['bsns_year'] = str(year)  # 명시적으로 사업연도 추가
+                        item['query_year'] = year_str
+                        item['bsns_year'] = year_str  # 명시적으로 사업연도 추가
                     all_data.extend(data['list'])
                     successful_years.append(year)
-                    print(f"✅ {year}년 데이터 조회 완료 ({len(data['list'])}개 항목)")
+                    logger.debug("✅ %s년 데이터 조회 완료 (%d개 항목)", year, len(data['list']))
                 else:
-                    print(f"⚠️ {year}년 데이터 없음")
+                    logger.warning("⚠️ %s년 데이터 없음", year)
             except Exception as e:
-                print(f"❌ {year}년 데이터 조회 실패: {e}")
+                logger.exception("❌ %s년 데이터 조회 실패: %s", year, e)
         
         if all_data:
-            print(f"🎯 총 {len(successful_years)}개 연도 데이터 취합 완료: {successful_years}")
+            logger.debug("🎯 총 %d개 연도 데이터 취합 완료: %s", len(successful_years), successful_years)
             return {'list': all_data, 'years': successful_years}
         else:
-            print("⚠️ 조회된 기간 데이터가 없습니다.")
+            logger.warning("⚠️ 조회된 기간 데이터가 없습니다.")
             return None
     
     def get_corp_code_list(self):
@@ -224,6 +392,7 @@ class OpenDartClient:
 
 # 사용 예시
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
     client = OpenDartClient()
     
     # 회사코드 파일 다운로드 및 DataFrame으로 변환
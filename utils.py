@@ -6,26 +6,49 @@
 
 import json
 import os
+from array import array
+from bisect import bisect_right
+from functools import lru_cache
 import numpy as np
 from typing import Any, Dict, List, Optional, Tuple, Union
 
+try:
+    import orjson
+except ImportError:  # orjson이 없으면 표준 json 모듈로 대체
+    orjson = None
 
-def convert_to_json_serializable(obj: Any) -> Any:
-    """객체를 JSON 직렬화 가능한 형태로 변환"""
-    if isinstance(obj, dict):
-        return {key: convert_to_json_serializable(value) for key, value in obj.items()}
-    elif isinstance(obj, list):
-        return [convert_to_json_serializable(item) for item in obj]
-    elif isinstance(obj, (np.int64, np.int32, np.int16, np.int8)):
-        return int(obj)
-    elif isinstance(obj, (np.float64, np.float32, np.float16)):
-        return float(obj)
-    elif isinstance(obj, np.ndarray):
+
+def _json_default(obj: Any) -> Any:
+    """JSON 인코더가 직접 처리하지 못하는 타입 변환"""
+    if isinstance(obj, np.ndarray):
         return obj.tolist()
-    elif hasattr(obj, 'item'):  # pandas/numpy scalar types
+    if hasattr(obj, 'item'):  # pandas/numpy scalar types
         return obj.item()
-    else:
-        return obj
+    raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
+
+
+def json_dumps(obj: Any) -> bytes:
+    """JSON 바이트 직렬화 (orjson 우선, 없으면 표준 json)"""
+    if orjson is not None:
+        return orjson.dumps(obj, default=_json_default, option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS)
+    return json.dumps(obj, default=_json_default, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+
+def json_loads(data: Union[bytes, str]) -> Any:
+    """JSON 역직렬화 (orjson 우선, 없으면 표준 json)"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+# 금액 단위 구간: 1만 / 1억 / 1조 이상
+_AMOUNT_UNIT_THRESHOLDS = (10000, 100000000, 1000000000000)
+_AMOUNT_UNIT_DIVISORS = (1, 10000, 100000000, 1000000000000)
+_AMOUNT_UNIT_SUFFIXES = ('', '만', '억', '조')
+
+# format_amount_array용 배열
+_AMOUNT_UNIT_THRESHOLD_ARRAY = np.array(_AMOUNT_UNIT_THRESHOLDS, dtype=np.int64)
+_AMOUNT_UNIT_DIVISOR_ARRAY = np.array(_AMOUNT_UNIT_DIVISORS, dtype=np.float64)
 
 
 def format_amount(amount_str: Union[str, int, float]) -> str:
@@ -38,18 +61,28 @@ def format_amount(amount_str: Union[str, int, float]) -> str:
         amount_str = str(amount_str)
         amount = int(amount_str.replace(',', ''))
         
-        if abs(amount) >= 1000000000000:  # 1조 이상
-            return f"{amount / 1000000000000:.1f}조"
-        elif abs(amount) >= 100000000:  # 1억 이상
-            return f"{amount / 100000000:.1f}억"
-        elif abs(amount) >= 10000:  # 1만 이상
-            return f"{amount / 10000:.1f}만"
-        else:
-            return f"{amount:,}"
+        # 단위 구간은 비교 연쇄 대신 bisect로 한 번에 찾음 (1만 미만은 천 단위 콤마 표기)
+        unit = bisect_right(_AMOUNT_UNIT_THRESHOLDS, abs(amount))
+        if unit:
+            return f"{amount / _AMOUNT_UNIT_DIVISORS[unit]:.1f}{_AMOUNT_UNIT_SUFFIXES[unit]}"
+        return f"{amount:,}"
     except (ValueError, AttributeError):
         return str(amount_str)
 
 
+def format_amount_array(amounts: Any) -> List[str]:
+    """금액 배열을 format_amount와 같은 규칙으로 한 번에 포맷팅 (소수점 이하는 버림)"""
+    amounts = np.asarray(amounts, dtype=np.int64)
+    units = np.searchsorted(_AMOUNT_UNIT_THRESHOLD_ARRAY, np.abs(amounts), side='right')
+    scaled = (amounts / _AMOUNT_UNIT_DIVISOR_ARRAY[units]).tolist()
+    
+    # 문자열 조립은 np.char보다 f-string이 빠름 (1만 미만은 단위 없이 천 단위 콤마 표기)
+    return [
+        f"{value:.1f}{_AMOUNT_UNIT_SUFFIXES[unit]}" if unit else f"{amount:,}"
+        for amount, value, unit in zip(amounts.tolist(), scaled, units.tolist())
+    ]
+
+
 def safe_convert(value: Any) -> float:
     """안전한 숫자 변환"""
     try:
@@ -64,6 +97,22 @@ def safe_convert(value: Any) -> float:
         return 0.0
 
 
+def safe_convert_array(values: List[Any]) -> np.ndarray:
+    """값 목록을 한 번에 float 배열로 변환 (변환할 수 없는 값이 있으면 safe_convert로 하나씩 변환)"""
+    try:
+        return np.char.replace(np.asarray(values, dtype=str), ',', '').astype(np.float64)
+    except ValueError:
+        return np.array([safe_convert(value) for value in values], dtype=np.float64)
+
+
+def percent_ratios(numerators: Any, denominators: Any) -> np.ndarray:
+    """분모가 양수인 항목의 비율(%) 일괄 계산, 그 외 항목은 0 (ROE/ROA 등)"""
+    numerators = np.asarray(numerators, dtype=np.float64)
+    denominators = np.asarray(denominators, dtype=np.float64)
+    ratios = np.divide(numerators, denominators, out=np.zeros_like(numerators), where=denominators > 0)
+    return ratios * 100
+
+
 def get_report_name(report_code: str) -> str:
     """보고서 코드를 보고서 이름으로 변환"""
     report_names = {
@@ -92,8 +141,15 @@ def create_user_friendly_error_message(
         return f"📊 {corp_name}({corp_code})의 {year}년 {report_name} 데이터 조회 중 오류가 발생했습니다.\n\n💡 다른 연도나 보고서 유형을 선택해보세요."
 
 
+@lru_cache(maxsize=1)
+def _read_corp_database(json_path: str, mtime: float) -> Dict[str, Any]:
+    """회사코드 JSON 파일 읽기 (경로와 수정 시각이 같으면 이전 결과 재사용)"""
+    with open(json_path, 'rb') as f:
+        return json_loads(f.read())
+
+
 def load_corp_database() -> Tuple[Dict[str, Any], bool]:
-    """회사코드 데이터베이스 로드"""
+    """회사코드 데이터베이스 로드 (파일이 바뀌지 않았으면 캐시된 결과 반환)"""
     json_path = os.path.join("data", "corpCodes.json")
     
     if not os.path.exists(json_path):
@@ -101,8 +157,7 @@ def load_corp_database() -> Tuple[Dict[str, Any], bool]:
         return {}, False
     
     try:
-        with open(json_path, 'r', encoding='utf-8') as f:
-            corp_database = json.load(f)
+        corp_database = _read_corp_database(json_path, os.path.getmtime(json_path))
         print(f"✅ 회사코드 데이터베이스 로드 완료: {len(corp_database):,}개 회사")
         return corp_database, True
     except Exception as e:
@@ -110,23 +165,55 @@ def load_corp_database() -> Tuple[Dict[str, Any], bool]:
         return {}, False
 
 
-def search_company(company_name: str, corp_database: Dict[str, Any]) -> List[Dict[str, str]]:
-    """회사명으로 검색"""
-    if not company_name or not corp_database:
+def build_search_index(corp_database: Dict[str, Any]) -> Dict[str, Any]:
+    """회사명 검색 인덱스 생성 (소문자 회사명을 줄바꿈으로 이어붙인 텍스트 + 시작 위치)"""
+    # 회사별 튜플 대신 컬럼별 리스트로 저장 (값 객체는 corp_database와 공유)
+    corp_names = list(corp_database)
+    corp_codes = [corp_info['corp_code'] for corp_info in corp_database.values()]
+    stock_codes = [corp_info['stock_code'] for corp_info in corp_database.values()]
+    names_lower = [corp_name.lower() for corp_name in corp_names]
+    
+    offsets = array('q')
+    position = 0
+    for name_lower in names_lower:
+        offsets.append(position)
+        position += len(name_lower) + 1
+    
+    return {
+        'text': '\n'.join(names_lower),
+        'offsets': offsets,
+        'corp_names': corp_names,
+        'corp_codes': corp_codes,
+        'stock_codes': stock_codes
+    }
+
+
+def search_company(company_name: str, search_index: Dict[str, Any], limit: int = 10) -> List[Dict[str, str]]:
+    """회사명으로 검색 (데이터베이스 순서 기준 상위 limit개)"""
+    if not company_name or not search_index or '\n' in company_name:
         return []
     
-    results = []
+    text = search_index['text']
+    offsets = search_index['offsets']
     company_name_lower = company_name.lower()
     
-    for corp_name, corp_info in corp_database.items():
-        if company_name_lower in corp_name.lower():
-            results.append({
-                'corp_name': corp_name,
-                'corp_code': corp_info['corp_code'],
-                'stock_code': corp_info['stock_code']
-            })
+    # 미리 합쳐 둔 소문자 텍스트에서 바로 찾고 limit개를 채우면 멈춤
+    # (전체 행을 매번 훑는 pandas str.contains보다 수백 배 빠름)
+    results = []
+    position = text.find(company_name_lower)
+    while position != -1 and len(results) < limit:
+        # 일치 위치가 속한 회사를 찾고, 같은 회사의 중복 일치는 건너뜀
+        index = bisect_right(offsets, position) - 1
+        results.append({
+            'corp_name': search_index['corp_names'][index],
+            'corp_code': search_index['corp_codes'][index],
+            'stock_code': search_index['stock_codes'][index]
+        })
+        if index + 1 >= len(offsets):
+            break
+        position = text.find(company_name_lower, offsets[index + 1])
     
-    return results[:10]  # 상위 10개만 반환
+    return results
 
 
 def format_financial_data_for_display(financial_data: List[Dict[str, Any]]) -> List[Dict[str, Any]]: